@@ -1,9 +1,13 @@
 import streamlit as st
-import pandas as pd
-from Bio import SeqIO
-import re
-from Bio.SeqUtils import gc_fraction, MeltingTemp as mt
+from Bio.SeqIO.FastaIO import SimpleFastaParser
+import hashlib
+import io
 from PIL import Image
+from crisprcraft.core import UPPER, extract_gRNAs
+
+# Show melting temperature, efficiency and cleavage columns next to GC and off-target results
+SHOW_ADVANCED = True
+ADVANCED_COLUMNS = ["Melting Temp (°C)", "Efficiency Score", "On-Target Cleavage Efficiency"]
 
 # Set page configuration
 st.set_page_config(page_title="CRISPRCraft", layout="wide")
@@ -12,59 +16,20 @@ st.set_page_config(page_title="CRISPRCraft", layout="wide")
 st.sidebar.title("CRISPRCraft Navigation")
 selection = st.sidebar.radio("Go to", ["Home", "gRNA Prediction", "About", "Contact Us"])
 
-def calculate_gc_content(sequence):
-    """Calculate GC content percentage."""
-    gc_percent = round(gc_fraction(sequence) * 100, 2)
-    return gc_percent, "Ideal Sequence" if 40 <= gc_percent <= 60 else "Non-Ideal Sequence"
-
-def melting_temperature(sequence):
-    """Calculate melting temperature using the Wallace rule."""
-    return mt.Tm_Wallace(sequence)
-
-def count_off_targets(sequence, gRNA):
-    """Counts approximate off-target sites by checking similar sequences."""
-    pattern = f'(?=({gRNA[:20]}))'
-    off_target_count = len(re.findall(pattern, sequence)) - 1  # Ignore perfect match
-    return off_target_count if off_target_count > 0 else "Low"
-
-def calculate_grna_efficiency(sequence):
-    """Placeholder for gRNA efficiency score (use Azimuth/DeepCRISPR models in the future)."""
-    return round((gc_fraction(sequence) * 100) / 2, 2)  # Simplified score for now
-
-def estimate_on_target_cleavage(sequence):
-    """Estimate gRNA on-target cleavage efficiency."""
-    return round(gc_fraction(sequence) * 100, 2)  # Simplified estimation for now
-
-def extract_gRNAs(sequence, pam):
-    """Extract gRNAs and compute GC content, off-targets, efficiency, and melting temperature."""
-    gRNAs = []
-    pam_regex = pam.replace('N', '.')  # Convert 'NGG' to regex
-    
-    for match in re.finditer(f'([ATCG]{{20}})({pam_regex})', sequence):
-        gRNA = match.group(1)
-        gc_content, status = calculate_gc_content(gRNA)
-        off_target = count_off_targets(sequence, gRNA)
-        tm = melting_temperature(gRNA)
-        efficiency_score = calculate_grna_efficiency(gRNA)
-        cleavage_efficiency = estimate_on_target_cleavage(gRNA)
-        
-        gRNAs.append({
-            "gRNA Sequence": gRNA, 
-            "GC Content (%)": gc_content, 
-            "GC Status": status,
-            "Melting Temp (°C)": round(tm, 2),
-            "Off-Target Risk": off_target,
-            "Efficiency Score": efficiency_score,
-            "On-Target Cleavage Efficiency": cleavage_efficiency
-        })
-    
-    return gRNAs[:50]  # Limit to top 50 gRNAs
+@st.cache_data(max_entries=16, show_spinner=False)
+def cached_extract_gRNAs(sequence_digest, pam, _sequence):
+    """Memoize extract_gRNAs per (sequence digest, PAM); `_sequence` itself is not hashed by Streamlit."""
+    return extract_gRNAs(_sequence, pam)
+
+@st.cache_resource
+def load_logo():
+    """Decode the logo once and reuse it across reruns."""
+    return Image.open("logo.jpg").copy()  # Ensure you have this image file
  
 if selection == "Home":
     st.markdown("<h1 style='text-align: center;'>Welcome to CRISPRCraft: Your Precision gRNA Design Tool</h1>", unsafe_allow_html=True)
     
-    logo = Image.open("logo.jpg")  # Ensure you have this image file
-    st.image(logo, width=400)
+    st.image(load_logo(), width=400)
 
     st.write("**CRISPRCraft** is an advanced platform designed for **guide RNA (gRNA) selection** in CRISPR genome editing. The other features of CRISPRCRAFT include:")
     st.markdown("""
@@ -103,25 +68,30 @@ elif selection == "gRNA Prediction":
         pam_sequence = st.text_input("Enter custom PAM sequence", "NGG")
     
     if st.button("Predict gRNAs"):
-        sequence = ""
+        sequence = b""
         if uploaded_file:
             st.success("File uploaded successfully!")
             if uploaded_file.name.endswith(".txt"):
-                sequence = uploaded_file.read().decode("utf-8").strip().upper()
+                sequence = uploaded_file.read().strip().translate(UPPER)  # Stay in bytes; no str.upper() copy
             else:
-                records = list(SeqIO.parse(uploaded_file, "fasta"))
-                sequence = str(records[0].seq).upper() if records else ""
+                handle = io.TextIOWrapper(uploaded_file, encoding="ascii", errors="replace")  # SeqIO needs a text handle
+                record = next(SimpleFastaParser(handle), None)  # Only the first record is analysed
+                # One "?" per undecodable byte keeps positions aligned; bytes(Seq) would expand each to 3 bytes
+                sequence = record[1].encode("ascii", "replace").translate(UPPER) if record else b""
         elif sequence_input:
-            sequence = sequence_input.strip().upper()
+            sequence = sequence_input.strip().encode("ascii", "replace").translate(UPPER)
 
         if sequence:
-            gRNAs = extract_gRNAs(sequence, pam_sequence)
-            if gRNAs:
-                df = pd.DataFrame(gRNAs)
+            sequence_digest = hashlib.blake2b(sequence, digest_size=16).hexdigest()
+            df = cached_extract_gRNAs(sequence_digest, pam_sequence, sequence)
+            if not SHOW_ADVANCED:
+                df = df.drop(columns=ADVANCED_COLUMNS)
+            if not df.empty:
                 st.dataframe(df)
 
-                csv = df.to_csv(index=False).encode('utf-8')
-                st.download_button("Download gRNA CSV", csv, "gRNAs.csv", "text/csv")
+                csv = io.BytesIO()  # Write bytes directly rather than building a str and encoding it
+                df.to_csv(csv, index=False, encoding='utf-8')
+                st.download_button("Download gRNA CSV", csv.getvalue(), "gRNAs.csv", "text/csv")
             else:
                 st.warning("No gRNAs found with the given PAM sequence.")
 
@@ -0,0 +1 @@
+"""Sequence-scanning helpers for the CRISPRCraft Streamlit app."""
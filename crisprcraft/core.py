@@ -0,0 +1,228 @@
+"""gRNA scanning and scoring used by the CRISPRCraft Streamlit app."""
+import re
+import functools
+
+import numpy as np
+import pandas as pd
+
+from crisprcraft import kernels
+
+GRNA_LENGTH = 20
+INVALID = 4
+NT_CODES = np.full(256, INVALID, dtype=np.uint8)  # ASCII byte -> 2-bit code, INVALID for anything but ACGT
+NT_CODES[np.frombuffer(b"ACGT", dtype=np.uint8)] = np.arange(4)
+IS_GC = bytes(1 if chr(b) in "GC" else 0 for b in range(256))
+MAX_HOMOPOLYMER = 10  # Longer single-base runs are flagged as high off-target risk without a search
+TOP_GRNAS = 50
+OFF_TARGET_CHUNK = 1 << 20  # Windows packed per pass when counting off-targets without Numba
+UPPER = bytes(c - 32 if 97 <= c <= 122 else c for c in range(256))  # bytes.translate table for ASCII upper-casing
+
+def _to_bytes(sequence):
+    """Return a DNA sequence as ASCII bytes; sequences may be passed as str or bytes."""
+    return sequence if isinstance(sequence, bytes) else sequence.encode("ascii", "replace")
+
+def _as_bytes(sequence):
+    """View a DNA sequence as a uint8 array of ASCII codes."""
+    return np.frombuffer(_to_bytes(sequence), dtype=np.uint8)
+
+def _encode(sequence):
+    """Encode a DNA sequence as nucleotide codes (A=0, C=1, G=2, T=3, other=INVALID)."""
+    return NT_CODES[_as_bytes(sequence)]
+
+def _pack(codes, width):
+    """Pack every window of `width` 2-bit codes into a single uint64 word."""
+    count = max(len(codes) - width + 1, 0)
+    bits = codes & 3
+    packed = np.zeros(count, dtype=np.uint64)
+    for offset in range(width):
+        packed <<= np.uint64(2)
+        packed |= bits[offset:offset + count]
+    return packed
+
+def _valid_windows(codes, width):
+    """Flag every window of `width` codes that contains only ACGT, via a prefix sum of invalid codes."""
+    count = max(len(codes) - width + 1, 0)
+    invalid = np.concatenate(([0], np.cumsum(codes == INVALID, dtype=np.int32)))
+    return invalid[width:width + count] == invalid[:count]
+
+def _pam_codes(pam):
+    """Encode a PAM as one nucleotide code per position, with -1 for N."""
+    return np.array([-1 if base == "N" else NT_CODES[ord(base)] for base in pam], dtype=np.int8)
+
+def _pam_bits(pam):
+    """Build the (mask, pattern) pair matching a PAM at the end of a packed window."""
+    if not pam or len(pam) > 32 - GRNA_LENGTH or set(pam) - set("ACGTN"):
+        return None
+    mask = pattern = 0
+    for code in _pam_codes(pam).tolist():
+        mask <<= 2
+        pattern <<= 2
+        if code >= 0:
+            mask |= 3
+            pattern |= code
+    return np.uint64(mask), np.uint64(pattern)
+
+@functools.lru_cache(maxsize=32)
+def _pam_pattern(pam):
+    """Compile the protospacer+PAM lookahead regex once per PAM."""
+    pam_regex = pam.replace('N', '[ACGT]')  # Convert 'NGG' to regex
+    return re.compile(f'(?=[ATCG]{{20}}{pam_regex})'.encode())
+
+def _gc_counts(sequence, starts):
+    """Count G and C bases in the 20-mer at every start index using a prefix sum."""
+    is_gc = np.frombuffer(IS_GC, dtype=np.uint8)[_as_bytes(sequence)]
+    cum = np.concatenate(([0], np.cumsum(is_gc, dtype=np.int32)))
+    return cum[starts + GRNA_LENGTH] - cum[starts]
+
+@functools.lru_cache(maxsize=32)
+def _super_pam_table(pam):
+    """Tabulate PAM hits for every (previous, current) pair of 4-base super-symbols.
+
+    Bit r of entry [prev, cur] is set when the PAM ends at base r of `cur`. A PAM of
+    up to five bases reaches back no further than `prev`, so the previous super-symbol
+    is the whole scan state and the table can be applied as a single gather.
+    """
+    pairs = np.arange(256 * 256, dtype=np.uint32)
+    bases = (pairs[:, np.newaxis] >> (2 * np.arange(7, -1, -1, dtype=np.uint32))) & 3
+    table = np.zeros(len(pairs), dtype=np.uint8)
+    for r in range(4):
+        hit = np.ones(len(pairs), dtype=bool)
+        for offset, code in enumerate(_pam_codes(pam).tolist(), 5 + r - len(pam)):
+            if code >= 0:
+                hit &= bases[:, offset] == code
+        table |= hit.astype(np.uint8) << r
+    return table.reshape(256, 256)
+
+def _super_scan(codes, pam):
+    """Find PAM-site starts by packing 4 bases per byte and gathering hits 4 positions at a time."""
+    bits = codes & 3
+    if len(bits) % 4:
+        bits = np.concatenate((bits, np.zeros(4 - len(bits) % 4, dtype=np.uint8)))
+    supers = (bits[0::4] << 6) | (bits[1::4] << 4) | (bits[2::4] << 2) | bits[3::4]
+    previous = np.concatenate((np.zeros(1, dtype=np.uint8), supers[:-1]))
+    hit_masks = _super_pam_table(pam)[previous, supers]
+    ends = (hit_masks[:, np.newaxis] >> np.arange(4, dtype=np.uint8)) & 1
+    width = GRNA_LENGTH + len(pam)
+    starts = np.flatnonzero(ends.ravel()[width - 1:len(codes)])  # PAM end index -> protospacer start
+    return starts[_valid_windows(codes, width)[starts]]
+
+def _iter_suffix_sites(data, suffix, spacer):
+    """Yield protospacer starts by locating a fixed PAM suffix with bytes.find."""
+    pos = -1
+    while True:
+        pos = data.find(suffix, pos + 1)
+        if pos < 0:
+            break
+        start = pos - spacer - GRNA_LENGTH
+        if start < 0 or data[start:pos].translate(None, b"ACGT"):
+            continue  # Too close to the start, or not all ACGT
+        yield start
+
+def _regex_sites(sequence, pam):
+    """Find protospacer starts with the lookahead regex; works for any PAM text."""
+    return np.array([m.start() for m in _pam_pattern(pam).finditer(_to_bytes(sequence))], dtype=np.intp)
+
+def _suffix_sites(sequence, pam):
+    """Find protospacer starts for a PAM of leading Ns plus a fixed ACGT suffix."""
+    suffix = pam.lstrip("N")
+    spacer = len(pam) - len(suffix)
+    return np.fromiter(_iter_suffix_sites(_to_bytes(sequence), suffix.encode(), spacer), dtype=np.intp)
+
+def _packed_sites(codes, pam):
+    """Find protospacer starts by mask-comparing packed protospacer+PAM windows."""
+    mask, pattern = _pam_bits(pam)
+    hits = (_pack(codes, GRNA_LENGTH + len(pam)) & mask) == pattern
+    hits &= _valid_windows(codes, GRNA_LENGTH + len(pam))  # N in the PAM must still be ACGT
+    return np.flatnonzero(hits)
+
+def find_pam_sites(sequence, pam, codes=None):
+    """Return the start index and GC count of every 20-nt protospacer followed by the PAM.
+
+    Pass `codes` (from `_encode(sequence)`) when the caller already has them, so the sequence is encoded once.
+    """
+    if _pam_bits(pam) is None:
+        starts = _regex_sites(sequence, pam)
+        return starts, _gc_counts(sequence, starts)
+
+    if codes is None:
+        codes = _encode(sequence)
+    if kernels.NUMBA_AVAILABLE:
+        return kernels.scan_pam_sites(codes, _pam_codes(pam), GRNA_LENGTH)
+
+    suffix = pam.lstrip("N")
+    if "N" not in suffix and len(suffix) > 2:  # Sparse fixed suffix: let bytes.find (memchr) skip ahead
+        starts = _suffix_sites(sequence, pam)
+    elif len(pam) <= 5:  # Dense short PAMs such as NGG: super-alphabet gather
+        starts = _super_scan(codes, pam)
+    else:
+        starts = _packed_sites(codes, pam)
+    return starts, _gc_counts(sequence, starts)
+
+def _keys_at(codes, starts):
+    """Pack the 20-mer at each of `starts` into a uint64 key, without packing the whole sequence."""
+    keys = np.zeros(len(starts), dtype=np.uint64)
+    for offset in range(GRNA_LENGTH):
+        keys <<= np.uint64(2)
+        keys |= codes[starts + offset] & 3
+    return keys
+
+def _off_target_counts(codes, starts):
+    """Count each start's 20-mer over every ACGT window of `codes`."""
+    if not len(starts):
+        return np.zeros(0, dtype=np.int64)
+    keys, inverse = np.unique(_keys_at(codes, starts), return_inverse=True)
+    if kernels.NUMBA_AVAILABLE:
+        counts = kernels.count_kmers(codes, keys, GRNA_LENGTH)
+    else:
+        counts = np.zeros(len(keys), dtype=np.int64)
+        for lo in range(0, max(len(codes) - GRNA_LENGTH + 1, 0), OFF_TARGET_CHUNK):
+            chunk = codes[lo:lo + OFF_TARGET_CHUNK + GRNA_LENGTH - 1]  # Overlap so no window is split
+            kmers = _pack(chunk, GRNA_LENGTH)[_valid_windows(chunk, GRNA_LENGTH)]
+            slots = np.minimum(np.searchsorted(keys, kmers), len(keys) - 1)
+            counts += np.bincount(slots[keys[slots] == kmers], minlength=len(keys))
+    return counts[inverse] - 1  # Ignore perfect match
+
+def _protospacers_at(sequence, starts):
+    """Slice the 20-mer at every start index into an array of strings in one gather."""
+    index = starts[:, np.newaxis] + np.arange(GRNA_LENGTH)
+    return _as_bytes(sequence)[index].view(f"S{GRNA_LENGTH}").ravel().astype(str)
+
+def _longest_homopolymers(codes, starts):
+    """Return the longest single-base run in the 20-mer at every start index, read from the codes."""
+    windows = codes[starts[:, np.newaxis] + np.arange(GRNA_LENGTH)]
+    run = longest = np.ones(len(starts), dtype=np.intp)
+    for j in range(1, GRNA_LENGTH):
+        run = np.where(windows[:, j] == windows[:, j - 1], run + 1, 1)
+        longest = np.maximum(longest, run)
+    return longest
+
+def extract_gRNAs(sequence, pam):
+    """Extract gRNAs and compute GC content, off-targets, efficiency, and melting temperature."""
+    codes = _encode(sequence)
+    starts, gc_counts = find_pam_sites(sequence, pam, codes)
+    gc_percent = gc_counts * (100.0 / GRNA_LENGTH)
+    efficiency = (gc_percent / 2).round(2)  # Placeholder score; use Azimuth/DeepCRISPR models in the future
+    # Keep the top 50 by efficiency (ties in sequence order) before any per-gRNA work
+    top = np.argsort(-efficiency, kind="stable")[:TOP_GRNAS]
+    starts, gc_counts, gc_percent, efficiency = starts[top], gc_counts[top], gc_percent[top], efficiency[top]
+
+    gRNAs = _protospacers_at(sequence, starts)
+    gc_status = np.where((gc_percent >= 40) & (gc_percent <= 60), "Ideal Sequence", "Non-Ideal Sequence")
+    tm = 2.0 * (GRNA_LENGTH - gc_counts) + 4.0 * gc_counts  # Wallace rule: 2 * (A + T) + 4 * (G + C)
+    low_complexity = _longest_homopolymers(codes, starts) > MAX_HOMOPOLYMER
+    counts = np.zeros(len(starts), dtype=np.intp)
+    counts[~low_complexity] = _off_target_counts(codes, starts[~low_complexity])
+    off_targets = counts.astype(object)
+    off_targets[counts <= 0] = "Low"
+    off_targets[low_complexity] = "High"
+
+    df = pd.DataFrame({
+        "gRNA Sequence": gRNAs,
+        "GC Content (%)": gc_percent.round(2),
+        "GC Status": gc_status,
+        "Melting Temp (°C)": tm,
+        "Off-Target Risk": off_targets,
+        "Efficiency Score": efficiency,
+        "On-Target Cleavage Efficiency": gc_percent.round(2)  # Simplified estimation for now
+    })
+    return df
@@ -0,0 +1,101 @@
+"""Optional Numba kernels for the gRNA scan.
+
+Kept in an importable module rather than in app.py so that Streamlit reruns
+reuse the compiled functions instead of recompiling them on every click.
+Off-target counting runs on all cores; set NUMBA_NUM_THREADS to limit the thread count.
+"""
+import os
+import threading
+
+import numpy as np
+
+try:
+    from numba import config, njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE and "NUMBA_THREADING_LAYER" not in os.environ:
+    # Streamlit calls the kernels from its script threads; TBB can then hang the process on exit
+    config.THREADING_LAYER = "workqueue"
+
+# workqueue cannot run parallel regions from two threads at once, so sessions take turns
+_count_lock = threading.Lock()
+
+COUNT_CHUNK = 1 << 16  # Windows counted per parallel task
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def scan_pam_sites(codes, pam_codes, grna_length):
+        """Scan nucleotide codes for PAM sites, tracking protospacer GC with a rolling counter.
+
+        `codes` maps A, C, G, T to 0-3 and anything else to a larger value;
+        `pam_codes` holds one code per PAM position, or -1 for N. Returns the
+        start index and GC count of every protospacer whose window is all ACGT.
+        """
+        width = grna_length + len(pam_codes)
+        count = max(len(codes) - width + 1, 0)
+        starts = np.empty(count, dtype=np.intp)
+        gc_counts = np.empty(count, dtype=np.int32)
+        found = 0
+        last_invalid = -1
+        gc = 0
+        for i in range(min(width - 1, len(codes))):
+            if codes[i] > 3:
+                last_invalid = i
+        for i in range(min(grna_length, len(codes))):
+            gc += codes[i] == 1 or codes[i] == 2
+        for i in range(count):
+            if codes[i + width - 1] > 3:
+                last_invalid = i + width - 1
+            if i > 0:
+                gc += codes[i + grna_length - 1] == 1 or codes[i + grna_length - 1] == 2
+                gc -= codes[i - 1] == 1 or codes[i - 1] == 2
+            if last_invalid >= i:
+                continue
+            match = True
+            for k in range(len(pam_codes)):
+                if pam_codes[k] >= 0 and codes[i + grna_length + k] != pam_codes[k]:
+                    match = False
+                    break
+            if match:
+                starts[found] = i
+                gc_counts[found] = gc
+                found += 1
+        return starts[:found], gc_counts[:found]
+
+    @njit(cache=True)
+    def _count_range(codes, keys, grna_length, lo, hi, counts):
+        """Add matches of each sorted key among the windows starting lo..hi-1, using a rolling 2-bit key."""
+        mask = (np.uint64(1) << np.uint64(2 * grna_length)) - np.uint64(1)
+        key = np.uint64(0)
+        last_invalid = -1
+        for i in range(lo, hi + grna_length - 1):
+            if codes[i] > 3:
+                last_invalid = i
+            key = ((key << np.uint64(2)) | np.uint64(codes[i] & 3)) & mask
+            start = i - grna_length + 1
+            if start < lo or last_invalid >= start:
+                continue
+            j = np.searchsorted(keys, key)
+            if j < len(keys) and keys[j] == key:
+                counts[j] += 1
+
+    @njit(parallel=True, cache=True)
+    def _count_kmers(codes, keys, grna_length, chunk):
+        """Count every key across all ACGT windows, splitting the sequence into parallel chunks."""
+        count = max(len(codes) - grna_length + 1, 0)
+        chunks = (count + chunk - 1) // chunk
+        per_chunk = np.zeros((chunks, len(keys)), dtype=np.int64)
+        for c in prange(chunks):
+            _count_range(codes, keys, grna_length, c * chunk, min((c + 1) * chunk, count), per_chunk[c])
+        return per_chunk.sum(axis=0)
+
+    def count_kmers(codes, keys, grna_length, chunk=COUNT_CHUNK):
+        """Count occurrences of each sorted packed key in `codes`, one caller at a time."""
+        with _count_lock:
+            return _count_kmers(codes, keys, grna_length, chunk)
+
+    # Compile (or load the on-disk cache) at import instead of on the first click
+    scan_pam_sites(np.zeros(100, dtype=np.uint8), np.array([-1, 2, 2], dtype=np.int8), 20)
+    count_kmers(np.zeros(100, dtype=np.uint8), np.zeros(1, dtype=np.uint64), 20)
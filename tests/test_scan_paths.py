@@ -0,0 +1,75 @@
+"""Check every PAM scan path in crisprcraft.core against a brute-force reference."""
+import random
+
+import numpy as np
+import pytest
+
+from crisprcraft import core, kernels
+
+# (PAM, paths that can handle it)
+PAMS = [
+    ("NGG", {"regex", "suffix", "super", "packed", "numba"}),
+    ("NAG", {"regex", "suffix", "super", "packed", "numba"}),
+    ("TTTG", {"regex", "suffix", "super", "packed", "numba"}),
+    ("NAGAA", {"regex", "suffix", "super", "packed", "numba"}),
+    ("TTTN", {"regex", "super", "packed", "numba"}),
+    ("NGNG", {"regex", "super", "packed", "numba"}),
+    ("NNNNN", {"regex", "super", "packed", "numba"}),
+    ("NNGRRT", {"regex"}),
+    ("NGGNGG", {"regex", "packed", "numba"}),
+    ("NNNGGN", {"regex", "packed", "numba"}),
+]
+
+
+def reference_sites(sequence, pam):
+    """Brute-force protospacer starts: 20 ACGT bases followed by the PAM (N = any ACGT)."""
+    starts = []
+    for start in range(len(sequence) - core.GRNA_LENGTH - len(pam) + 1):
+        protospacer = sequence[start:start + core.GRNA_LENGTH]
+        site = sequence[start + core.GRNA_LENGTH:start + core.GRNA_LENGTH + len(pam)]
+        if set(protospacer) <= set("ACGT") and all(
+            s in "ACGT" if p == "N" else s == p for p, s in zip(pam, site)
+        ):
+            starts.append(start)
+    return starts
+
+
+def scan(path, sequence, pam):
+    codes = core._encode(sequence)
+    if path == "regex":
+        return core._regex_sites(sequence, pam)
+    if path == "suffix":
+        return core._suffix_sites(sequence, pam)
+    if path == "super":
+        return core._super_scan(codes, pam)
+    if path == "packed":
+        return core._packed_sites(codes, pam)
+    starts, gc_counts = kernels.scan_pam_sites(codes, core._pam_codes(pam), core.GRNA_LENGTH)
+    assert gc_counts.tolist() == core._gc_counts(sequence, starts).tolist()
+    return starts
+
+
+def random_sequences(count=200, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        length = rng.randint(0, 300)
+        yield "".join(rng.choice("ACGTGGAATTTN") for _ in range(length))
+
+
+@pytest.mark.parametrize("path", ["regex", "suffix", "super", "packed", "numba"])
+def test_scan_paths_match_reference(path):
+    if path == "numba" and not kernels.NUMBA_AVAILABLE:
+        pytest.skip("numba is not installed")
+    for sequence in random_sequences():
+        for pam, paths in PAMS:
+            if path in paths:
+                assert scan(path, sequence, pam).tolist() == reference_sites(sequence, pam), (path, pam, sequence)
+
+
+def test_find_pam_sites_gc_counts():
+    for sequence in random_sequences(50, seed=1):
+        for pam, _ in PAMS:
+            starts, gc_counts = core.find_pam_sites(sequence, pam)
+            assert starts.tolist() == reference_sites(sequence, pam)
+            expected = [sum(base in "GC" for base in sequence[s:s + core.GRNA_LENGTH]) for s in starts]
+            assert np.asarray(gc_counts).tolist() == expected